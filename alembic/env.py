@@ -1,11 +1,12 @@
 import os
-import re
 from logging.config import fileConfig
 
 from dotenv import find_dotenv, load_dotenv
 from sqlalchemy import create_engine
 from sqlmodel import SQLModel
 
+import cat_model  # noqa: F401 - registers Cat on SQLModel.metadata for autogenerate
+
 from alembic import context
 
 load_dotenv(find_dotenv())
@@ -28,9 +29,7 @@ def run_migrations_online() -> None:
     if url is None:
         raise ValueError("Could not find the DB url!")
 
-    pattern = re.compile("(\+asyncpg)")
-    if re.search(pattern, url):
-        url = re.sub(pattern, "", url)
+    url = url.replace("+asyncpg", "")
 
     engine = create_engine(url)
 
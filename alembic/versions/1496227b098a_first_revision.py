@@ -11,10 +11,6 @@ depends_on: Union[str, Sequence[str], None] = None
 
 
 def upgrade() -> None:
-    op.drop_table('cat')
-
-
-def downgrade() -> None:
     op.create_table('cat',
     sa.Column('id', sa.INTEGER(), autoincrement=True, nullable=False),
     sa.Column('name', sa.VARCHAR(), autoincrement=False, nullable=False),
@@ -24,3 +20,7 @@ def downgrade() -> None:
     sa.PrimaryKeyConstraint('id', name=op.f('cat_pkey'))
     )
     # ### end Alembic commands ###
+
+
+def downgrade() -> None:
+    op.drop_table('cat')
@@ -0,0 +1,37 @@
+"""add cat name index
+
+Revision ID: 3f9c2a7d41b6
+Revises: 1496227b098a
+Create Date: 2026-10-15 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f9c2a7d41b6'
+down_revision: Union[str, Sequence[str], None] = '1496227b098a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY can't run inside a transaction, but it doesn't block writes to cat.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            op.f('ix_cat_name'), 'cat', ['name'],
+            unique=False, postgresql_concurrently=True, if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            op.f('ix_cat_name'), table_name='cat',
+            postgresql_concurrently=True, if_exists=True,
+        )
@@ -1,13 +1,32 @@
 import os
-import json
+import asyncio
+import functools
 import logging
+import socket
 from typing import Any, Optional
 from datetime import datetime
+import msgpack
 import redis.asyncio as redis
-logging.basicConfig(level=logging.DEBUG)
 
 logger = logging.getLogger(__name__)
 
+# Detect dead Redis connections within ~1 minute instead of on the next command.
+_KEEPALIVE_OPTIONS = {
+    getattr(socket, name): value
+    for name, value in (("TCP_KEEPIDLE", 30), ("TCP_KEEPINTVL", 10), ("TCP_KEEPCNT", 3))
+    if hasattr(socket, name)
+}
+
+# Read and drop an index set atomically, so a key SADDed concurrently can't outlive its index.
+_DELETE_INDEX = """
+local members = redis.call('SMEMBERS', KEYS[1])
+for i = 1, #members, 1000 do
+    redis.call('DEL', unpack(members, i, math.min(i + 999, #members)))
+end
+redis.call('DEL', unpack(KEYS))
+return #members
+"""
+
 class CacheManager:
 
     def __init__(self):
@@ -18,9 +37,13 @@ class CacheManager:
         self.enabled = os.getenv("CACHE_ENABLED", "true").lower() == "true"
         
         self.redis_client: Optional[redis.Redis] = None
+        self._inflight: dict[str, asyncio.Future] = {}
+        # One Packer reused for every call; aware datetimes use msgpack's native Timestamp ext.
+        self._packb = msgpack.Packer(use_bin_type=True, datetime=True, default=str).pack
+        self._unpackb = lambda b: msgpack.unpackb(b, raw=False, timestamp=3)
         logger.info(
-            f"CacheManager initialized: host={self.host}, port={self.port}, "
-            f"db={self.db}, enabled={self.enabled}"
+            "CacheManager initialized: host=%s, port=%s, db=%s, enabled=%s",
+            self.host, self.port, self.db, self.enabled,
         )
 
     async def connect(self) -> None:
@@ -29,24 +52,31 @@ class CacheManager:
             return
             
         try:
-            self.redis_client = redis.Redis(
+            pool = redis.BlockingConnectionPool(
                 host=self.host,
                 port=self.port,
                 db=self.db,
                 password=self.password,
-                decode_responses=True,
+                decode_responses=False,
                 socket_connect_timeout=5,
                 socket_keepalive=True,
+                socket_keepalive_options=_KEEPALIVE_OPTIONS,
+                health_check_interval=30,
+                retry_on_timeout=True,
+                max_connections=50,
+                timeout=5,
             )
+            self.redis_client = redis.Redis(connection_pool=pool)
             await self.redis_client.ping()
             logger.info("✓ Connected to Redis")
         except Exception as e:
-            logger.error(f"✗ Failed to connect to Redis: {e}")
+            logger.error("✗ Failed to connect to Redis: %s", e)
             self.redis_client = None
 
     async def disconnect(self) -> None:
         if self.redis_client:
             await self.redis_client.close()
+            await self.redis_client.connection_pool.disconnect()
             logger.info("Disconnected from Redis")
 
     async def get(self, key: str) -> Optional[Any]:
@@ -56,12 +86,12 @@ class CacheManager:
         try:
             value = await self.redis_client.get(key)
             if value:
-                logger.debug(f"Cache HIT: {key}")
-                return json.loads(value)
-            logger.debug(f"Cache MISS: {key}")
+                logger.debug("Cache HIT: %s", key)
+                return self._unpackb(value)
+            logger.debug("Cache MISS: %s", key)
             return None
         except Exception as e:
-            logger.error(f"Cache get error for key '{key}': {e}")
+            logger.error("Cache get error for key '%s': %s", key, e)
             return None
 
     async def set(self, key: str, value: Any, ttl: int = 3600) -> bool:
@@ -69,12 +99,88 @@ class CacheManager:
             return False
             
         try:
-            serialized = json.dumps(value, default=str)
+            serialized = self._packb(value)
             await self.redis_client.setex(key, ttl, serialized)
-            logger.debug(f"Cache SET: {key} (TTL: {ttl}s)")
+            logger.debug("Cache SET: %s (TTL: %ss)", key, ttl)
+            return True
+        except Exception as e:
+            logger.error("Cache set error for key '%s': %s", key, e)
+            return False
+
+    async def mset_ex(self, items: dict[str, Any], ttl: int = 3600) -> bool:
+        if not self.enabled or not self.redis_client or not items:
+            return False
+            
+        try:
+            async with self.redis_client.pipeline(transaction=False) as pipe:
+                self._queue_set_ex(pipe, items, ttl)
+                await pipe.execute()
+            logger.debug("Cache SET: %d keys (TTL: %ss)", len(items), ttl)
+            return True
+        except Exception as e:
+            logger.error("Cache set error for %d keys: %s", len(items), e)
+            return False
+
+    def _queue_set_ex(self, pipe, items: dict[str, Any], ttl: int) -> None:
+        for key, value in items.items():
+            pipe.set(key, self._packb(value), ex=ttl)
+
+    async def mset_ids(
+        self,
+        ids_key: str,
+        ids: list[Any],
+        items: dict[str, Any],
+        ttl: int = 3600,
+        ids_ttl: int = 3600,
+        index_key: Optional[str] = None,
+    ) -> bool:
+        if not self.enabled or not self.redis_client:
+            return False
+            
+        try:
+            async with self.redis_client.pipeline(transaction=False) as pipe:
+                self._queue_set_ex(pipe, items, ttl)
+                self._queue_set_ex(pipe, {ids_key: ids}, ids_ttl)
+                if index_key:
+                    pipe.sadd(index_key, ids_key)
+                    pipe.expire(index_key, ids_ttl)
+                await pipe.execute()
+            logger.debug("Cache SET: %s + %d keys (TTL: %ss)", ids_key, len(items), ttl)
             return True
         except Exception as e:
-            logger.error(f"Cache set error for key '{key}': {e}")
+            logger.error("Cache set error for key '%s': %s", ids_key, e)
+            return False
+
+    async def mget_ids(self, ids_key: str, prefix: str) -> Optional[dict[Any, Optional[Any]]]:
+        if not self.enabled or not self.redis_client:
+            return None
+            
+        try:
+            ids = await self.get(ids_key)
+            if ids is None:
+                return None
+            values = await self.redis_client.mget([f"{prefix}{id_}" for id_ in ids]) if ids else []
+            if logger.isEnabledFor(logging.DEBUG):
+                hits = sum(value is not None for value in values)
+                logger.debug("Cache MGET: %s (%d/%d hits)", ids_key, hits, len(ids))
+            return {
+                id_: self._unpackb(value) if value is not None else None
+                for id_, value in zip(ids, values)
+            }
+        except Exception as e:
+            logger.error("Cache mget error for key '%s': %s", ids_key, e)
+            return None
+
+    async def delete_index(self, index_key: str, *keys: str) -> bool:
+        if not self.enabled or not self.redis_client:
+            return False
+            
+        try:
+            deleted = await self.redis_client.eval(_DELETE_INDEX, 1 + len(keys), index_key, *keys)
+            logger.debug("Cache DELETE: %s (%d members) %s", index_key, deleted, keys)
+            return True
+        except Exception as e:
+            logger.error("Cache index delete error for key '%s': %s", index_key, e)
             return False
 
     async def exists(self, key: str) -> bool:
@@ -85,7 +191,7 @@ class CacheManager:
             result = await self.redis_client.exists(key)
             return result > 0
         except Exception as e:
-            logger.error(f"Cache exists error for key '{key}': {e}")
+            logger.error("Cache exists error for key '%s': %s", key, e)
             return False
 
     async def delete(self, key: str) -> bool:
@@ -94,10 +200,10 @@ class CacheManager:
             
         try:
             result = await self.redis_client.delete(key)
-            logger.debug(f"Cache DELETE: {key}")
+            logger.debug("Cache DELETE: %s", key)
             return result > 0
         except Exception as e:
-            logger.error(f"Cache delete error for key '{key}': {e}")
+            logger.error("Cache delete error for key '%s': %s", key, e)
             return False
 
     async def flush(self) -> bool:
@@ -109,7 +215,7 @@ class CacheManager:
             logger.info("Cache FLUSHED")
             return True
         except Exception as e:
-            logger.error(f"Cache flush error: {e}")
+            logger.error("Cache flush error: %s", e)
             return False
 
     async def get_or_set(
@@ -119,6 +225,33 @@ class CacheManager:
         if cached is not None:
             return cached
         
+        if not self.enabled or not self.redis_client:
+            return await callback()
+        
+        # Single-flight: concurrent misses on one key share the first caller's load,
+        # including its exception, so a burst for a missing row runs one query.
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._load(key, callback, ttl))
+            self._inflight[key] = task
+            task.add_done_callback(functools.partial(self._forget_inflight, key))
+        
+        # shield: a cancelled request must not cancel the load other callers await.
+        return await asyncio.shield(task)
+
+    def _forget_inflight(self, key: str, task: asyncio.Future) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # Mark the exception retrieved in case every awaiting request was cancelled.
+        if not task.cancelled():
+            task.exception()
+
+    async def _load(self, key: str, callback, ttl: int) -> Any:
+        # A flight that finished after our first miss may already have filled the key.
+        cached = await self.get(key)
+        if cached is not None:
+            return cached
+        
         result = await callback()
         
         await self.set(key, result, ttl)
@@ -127,5 +260,3 @@ class CacheManager:
 
 
 cache_manager = CacheManager()
-cache_manager = CacheManager()
-cache_manager.set('key', 'value') 
\ No newline at end of file
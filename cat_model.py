@@ -5,7 +5,7 @@ from sqlmodel import Field, SQLModel
 
 class Cat(SQLModel, table=True):
     id: int | None = Field(default=None, primary_key=True)
-    name: str
+    name: str = Field(index=True)
     age: Annotated[int, Field(gt = 0,lt = 100 )]
     weight: Annotated[float, Field(gt=0, lt = 100)]
     breed: str
\ No newline at end of file
@@ -5,9 +5,20 @@ from dotenv import find_dotenv, load_dotenv
 load_dotenv(find_dotenv())
 
 
+# Set to 0 behind PgBouncer in transaction mode, where prepared statements break.
+statement_cache_size = int(os.getenv("DB_STATEMENT_CACHE_SIZE", 512))
+
 engine = create_async_engine(
     os.getenv("DATABASE_URL"),
-    echo=True,
+    connect_args={
+        "prepared_statement_cache_size": statement_cache_size,
+        "statement_cache_size": statement_cache_size,
+    },
+    echo=False,
+    pool_size=20,
+    max_overflow=10,
+    pool_pre_ping=True,
+    pool_recycle=3600,
     future=True,
 )
 
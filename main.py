@@ -1,8 +1,14 @@
 from contextlib import asynccontextmanager
+import logging
 import os
-from typing import Optional
-from fastapi import FastAPI, HTTPException
-from sqlmodel import SQLModel, delete, select
+from typing import Annotated, Optional
+import orjson
+from fastapi import Body, FastAPI, HTTPException, Query, Response
+from sqlmodel import SQLModel, delete, insert, select, update
+
+# Configure before importing the cache, which logs at import time.
+logging.basicConfig(level=logging.INFO)
+
 from cat_schema import CatSchema
 from cat_model import Cat
 from db import async_session, engine
@@ -11,8 +17,10 @@ from cache import cache_manager
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    async with engine.begin() as conn:
-        await conn.run_sync(SQLModel.metadata.create_all)
+    # Schema is owned by Alembic; create_all is only a dev-time safety net.
+    if os.getenv("AUTO_CREATE_ALL") == "1":
+        async with engine.begin() as conn:
+            await conn.run_sync(SQLModel.metadata.create_all)
     
     await cache_manager.connect()
     
@@ -24,21 +32,39 @@ async def lifespan(app: FastAPI):
 app = FastAPI(lifespan=lifespan)
 
 
+def _json_response(content) -> Response:
+    # Cached payloads are already plain dicts, so skip FastAPI's jsonable_encoder pass.
+    return Response(content=orjson.dumps(content), media_type="application/json")
+
+
 @app.post("/cats")
 async def create_cat(cat: CatSchema):
     """Create new cat and invalidate cache."""
-    cat_model = Cat(**cat.model_dump())
-
     async with async_session() as session:
-        session.add(cat_model)
+        stmt = insert(Cat).values(**cat.model_dump()).returning(Cat)
+        result = await session.execute(stmt)
+        cat_model = result.scalar_one()
         await session.commit()
-        await session.refresh(cat_model)
     
-    await cache_manager.delete("cats:all")
+    await cache_manager.delete_index("cats:pages")
 
     return cat_model
 
 
+@app.post("/cats/bulk")
+async def create_cats(cats: Annotated[list[CatSchema], Body(min_length=1, max_length=1000)]):
+    """Create many cats in one transaction and invalidate cache once."""
+    async with async_session() as session:
+        stmt = insert(Cat).returning(Cat, sort_by_parameter_order=True)
+        result = await session.execute(stmt, [cat.model_dump() for cat in cats])
+        cat_models = result.scalars().all()
+        await session.commit()
+    
+    await cache_manager.delete_index("cats:pages")
+
+    return cat_models
+
+
 @app.delete("/cats/{cat_id}")
 async def delete_cat(cat_id: int):
     """Delete cat and invalidate cache."""
@@ -47,91 +73,99 @@ async def delete_cat(cat_id: int):
         await session.execute(stmt)
         await session.commit()
     
-    await cache_manager.delete("cats:all")
+    await cache_manager.delete_index("cats:pages", f"cat:{cat_id}")
     
     return {"message": f"Cat with id '{cat_id}' was deleted"}
 
 
 @app.get("/")
-async def get_cats():
-    """Get all cats with caching."""
-    cache_key = "cats:all"
-    
-    cached_cats = await cache_manager.get(cache_key)
+async def get_cats(
+    limit: Annotated[int, Query(gt=0, le=1000)] = 100,
+    offset: Annotated[int, Query(ge=0)] = 0,
+):
+    """Get a page of cats with per-cat caching."""
+    page_key = f"cats:page:{offset}:{limit}"
+    
+    cached_cats = await cache_manager.mget_ids(page_key, "cat:")
     if cached_cats is not None:
-        return cached_cats
+        missing = [cat_id for cat_id, cat in cached_cats.items() if cat is None]
+        if not missing:
+            return _json_response(list(cached_cats.values()))
     
     async with async_session() as session:
-        stmt = select(Cat)
+        if cached_cats is None:
+            stmt = select(Cat.__table__).order_by(Cat.id).limit(limit).offset(offset)
+        else:
+            stmt = select(Cat.__table__).where(Cat.id.in_(missing))
         result = await session.execute(stmt)
-        cats = result.scalars().all()
+        fetched = {row["id"]: dict(row) for row in result.mappings()}
     
-    await cache_manager.set(cache_key, cats, ttl=300)
+    items = {f"cat:{cat_id}": cat for cat_id, cat in fetched.items()}
+    if cached_cats is None:
+        await cache_manager.mset_ids(
+            page_key, list(fetched), items, ttl=600, ids_ttl=300, index_key="cats:pages"
+        )
+        return _json_response(list(fetched.values()))
     
-    return cats
+    await cache_manager.mset_ex(items, ttl=600)
+    
+    cached_cats.update(fetched)
+    return _json_response([cat for cat in cached_cats.values() if cat is not None])
 
 
 @app.patch("/cats/{cat_id}")
 async def update_cat(cat_id: int, cat_for_update: CatSchema):
     """Update cat and invalidate cache."""
     async with async_session() as session:
-        stmt = select(Cat).where(Cat.id == cat_id)
+        stmt = (
+            update(Cat)
+            .where(Cat.id == cat_id)
+            .values(**cat_for_update.model_dump(exclude_unset=True))
+            .returning(Cat)
+        )
         result = await session.execute(stmt)
-        cat_to_update = result.scalars().first()
+        cat_to_update = result.scalar_one_or_none()
         if not cat_to_update:
             raise HTTPException(status_code=404, detail="Cat not found")
 
-        for key, value in cat_for_update.model_dump(exclude_unset=True).items():
-            setattr(cat_to_update, key, value)
-
         await session.commit()
-        await session.refresh(cat_to_update)
     
-    await cache_manager.delete("cats:all")
     await cache_manager.delete(f"cat:{cat_id}")
     
     return cat_to_update
 
 
-@app.get("/cats/{cat_id}")
-async def get_cat_by_id(cat_id: int):
-    """Get cat by ID with caching."""
-    cache_key = f"cat:{cat_id}"
-    
-    cached_cat = await cache_manager.get(cache_key)
-    if cached_cat is not None:
-        return cached_cat
-    
-    async with async_session() as session:
-        stmt = select(Cat).where(Cat.id == cat_id)
-        result = await session.execute(stmt)
-        cat = result.scalars().first()
-    
-    if not cat:
-        raise HTTPException(status_code=404, detail="Cat not found")
-    
-    await cache_manager.set(cache_key, cat, ttl=600)
-    
-    return cat
-
-
 @app.get("/cats/search")
 async def get_cat_by_name(cat_name: str):
     """Search cats by name with caching."""
-    cache_key = f"cat:name:{cat_name}"
-    
-    cached_cats = await cache_manager.get(cache_key)
-    if cached_cats is not None:
-        return cached_cats
+    async def load_cats():
+        async with async_session() as session:
+            stmt = select(Cat.__table__).where(Cat.name == cat_name)
+            result = await session.execute(stmt)
+            return [dict(row) for row in result.mappings()]
     
-    async with async_session() as session:
-        stmt = select(Cat).where(Cat.name == cat_name)
-        result = await session.execute(stmt)
-        cats = result.scalars().all()
-    
-    await cache_manager.set(cache_key, cats, ttl=300)
+    return _json_response(
+        await cache_manager.get_or_set(f"cat:name:{cat_name}", load_cats, ttl=300)
+    )
+
+
+@app.get("/cats/{cat_id}")
+async def get_cat_by_id(cat_id: int):
+    """Get cat by ID with caching."""
+    async def load_cat():
+        async with async_session() as session:
+            stmt = select(Cat.__table__).where(Cat.id == cat_id)
+            result = await session.execute(stmt)
+            row = result.mappings().first()
+        
+        if not row:
+            raise HTTPException(status_code=404, detail="Cat not found")
+        
+        return dict(row)
     
-    return cats
+    return _json_response(
+        await cache_manager.get_or_set(f"cat:{cat_id}", load_cat, ttl=600)
+    )
 
 
 @app.get("/cache/status")